@@ -19,6 +19,10 @@ import time
 import multiprocessing
 import errno
 import stat
+import fnmatch
+import select
+import struct
+import hashlib
 try:
 	from queue import Queue
 except:
@@ -38,14 +42,23 @@ ARTIFACTS_DIRECTORY_PATH = os.path.join(EXECUTABLE_DIRECTORY_PATH, ".irapp", "ar
 LOG_DIRECTORY_PATH = os.path.join(EXECUTABLE_DIRECTORY_PATH, ".irapp", "log")
 DEFAULT_CONFIG_FILE = ".irapp.json"
 
+# Dependencies loaded, they are shared by all in-process dispatched commands
+dependencies = None
+
 """
 Load the necessary dependencies
 """
 def loadDependencies():
+	global dependencies
+
+	if dependencies:
+		return dependencies
+
 	try:
 		if not os.path.isdir(DEPENDENCIES_PATH):
 			raise Exception("Missing tool dependencies at %s" % (DEPENDENCIES_PATH))
-		irapp = imp.load_module("irapp", None, DEPENDENCIES_PATH, ('', '', imp.PKG_DIRECTORY))
+		with trace.span("loadDependencies"):
+			irapp = imp.load_module("irapp", None, DEPENDENCIES_PATH, ('', '', imp.PKG_DIRECTORY))
 		if not irapp:
 			raise Exception("Could not load dependencies")
 	except Exception as e:
@@ -53,13 +66,22 @@ def loadDependencies():
 		lib.info("Consider updating with '%s update'" % (EXECUTABLE_NAME))
 		sys.exit(1)
 
+	# Record the commands spawned by the library
+	trace.instrument(irapp.lib)
+
 	# Load the dependencies
-	return irapp.loadModules(), irapp.getTypeList(), irapp.lib
+	with trace.span("loadModules"):
+		dependencies = (irapp.loadModules(), irapp.getTypeList(), irapp.lib)
+	return dependencies
 
 """
 Read the configruation file and create it if it does not exists.
 """
 def readConfig(args, verbose=True, dispatch=False, forceDispatchResults=False, forceDispatchSequential=False):
+	with trace.span("readConfig", root=args.rootPath):
+		return readConfigImpl(args, verbose, dispatch, forceDispatchResults, forceDispatchSequential)
+
+def readConfigImpl(args, verbose, dispatch, forceDispatchResults, forceDispatchSequential):
 	global lib
 
 	# Read the dependencies
@@ -75,10 +97,24 @@ def readConfig(args, verbose=True, dispatch=False, forceDispatchResults=False, f
 		"log": LOG_DIRECTORY_PATH,
 		# The parallelism allowed on this machine
 		"parallelism": multiprocessing.cpu_count(),
+		# Share the job tokens of "parallelism" with the whole process tree, including dispatched
+		# processes and build tools supporting the GNU make jobserver (make >= 4.4, ninja >= 1.13).
+		"jobserver": {
+			"enable": True,
+			# Hold back job tokens while the pressure from /proc/pressure (percentage of the time
+			# some tasks are stalled, averaged over 10s) is above these thresholds.
+			"pressure": {
+				# "cpu": 80, "memory": 20
+			}
+		},
 		# List of modules to be supported
 		"types": [],
 		# Dispatch commands to other subprojects
 		"dispatch": [],
+		# How to dispatch the commands, either "process" to run each of them in its own interpreter,
+		# concurrently and isolated, or "inprocess" to run them one after the other within this
+		# process, sharing the loaded modules, which is faster for many small subprojects.
+		"dispatchMode": "process",
 		# List of actions to be performed. The action called "default", will be executed if no
 		# specific action is called.
 		"start": {
@@ -89,6 +125,9 @@ def readConfig(args, verbose=True, dispatch=False, forceDispatchResults=False, f
 		"dependencies": {
 			# "debian": ["libssl-dev", "libcurl-dev"]
 		},
+		# Modules are initialized one after the other, except the ones listed here (or declaring
+		# "initConcurrent" themselves) which are initialized concurrently.
+		"initConcurrent": [],
 		# The tests to be run. All tests are categorized by test framework and or platform separated by a dot.
 		# Each of the test compize the relative file path to the root directory.
 		"tests": {
@@ -104,7 +143,20 @@ def readConfig(args, verbose=True, dispatch=False, forceDispatchResults=False, f
 			"windows": {"run": "%path%"}
 		},
 		# Ignore a specific configuration
-		"ignore": []
+		"ignore": [],
+		# Watch mode settings, used by "build --watch" and "test --watch"
+		"watch": {
+			# Patterns of files or directories to be ignored, in addition to the irapp, VCS and dependency
+			# directories and to the assets, artifacts and log directories of each project
+			"ignore": ["dist"],
+			# Time (in seconds) without changes before rebuilding
+			"debounce": 0.3,
+			# Input file patterns of the modules and the test types they map to. A module without entry
+			# is affected by any change, and without "tests", all tests are rerun when it is affected.
+			"modules": {
+				# "cmake": {"patterns": ["*.cpp", "*.h", "CMakeLists.txt"], "tests": ["gtest"]}
+			}
+		}
 	}
 
 	# Add logging prefix
@@ -115,6 +167,7 @@ def readConfig(args, verbose=True, dispatch=False, forceDispatchResults=False, f
 		lib.fatal("Root path (%s) is not a valid directory" % (args.rootPath))
 
 	# Read the configuration
+	configUser = {}
 	try:
 		f = open(os.path.join(args.rootPath, args.configPath), "r")
 		with f:
@@ -129,6 +182,15 @@ def readConfig(args, verbose=True, dispatch=False, forceDispatchResults=False, f
 		if verbose:
 			lib.warning("Could not open configuration file '%s', using default" % (str(args.configPath)))
 
+	# The command line takes precedence over the configuration file
+	if getattr(args, "dispatchMode", None):
+		config["dispatchMode"] = args.dispatchMode
+	if config["dispatchMode"] not in ["inprocess", "process"]:
+		lib.fatal("Unsupported dispatch mode '%s', must be either 'inprocess' or 'process'" % (str(config["dispatchMode"])))
+
+	# Join or create the jobserver shared by the whole process tree, it sets the actual parallelism
+	jobserver.setup(config, isCaller=(not args.dispatch))
+
 	# Add parameters that are not meant to be modified
 	config.update({
 		# Value is either: "linux", "windows" or "macos"
@@ -138,7 +200,9 @@ def readConfig(args, verbose=True, dispatch=False, forceDispatchResults=False, f
 		"pimpl": {},
 		"caller": True if not args.dispatch else False,
 		"dispatched": True if args.dispatch or len(config["dispatch"]) else False,
-		"dispatchResults": {}
+		"dispatchResults": {},
+		# Configuration as set by the user, before the module defaults are applied
+		"userConfig": configUser
 	})
 
 	# Resolve all path and make them absolute, plus create the directories if it does not exists
@@ -152,7 +216,12 @@ def readConfig(args, verbose=True, dispatch=False, forceDispatchResults=False, f
 	for moduleId in types:
 		moduleClass = modules[moduleId]
 		# Add module only if it checks correctly
-		if moduleId in config["types"] or moduleClass.check(config):
+		if moduleId in config["types"]:
+			isSupported = True
+		else:
+			with trace.span("check", module=moduleId):
+				isSupported = moduleClass.check(config)
+		if isSupported:
 			typeList.append(moduleId)
 			config["pimpl"][moduleId] = moduleClass
 			config[moduleId] = moduleClass.config()
@@ -172,70 +241,125 @@ def readConfig(args, verbose=True, dispatch=False, forceDispatchResults=False, f
 		})
 
 	# Generate the ignore dictionaries
-	config["ignoreDict"] = {}
-	for ignore in config["ignore"]:
-		keyList = ignore.split(".")
-		node = lastNode = config["ignoreDict"]
-		for key in keyList:
-			lastNode = node
-			node = lastNode.setdefault(key, {})
-			if node == True:
-				break
-		lastNode[key] = True
-
-	# Have a specific path per module (specific to this module)
-	# ex: git.[...]
-	def applyIgnore(ignoreDict, config):
-		for keyPattern in ignoreDict:
-			for configKey in [key for key in config.keys() if re.match(keyPattern.replace("*", ".*"), key)]:
-				if ignoreDict[keyPattern] == True:
-					del config[configKey]
-				else:
-					applyIgnore(ignoreDict[keyPattern], config[configKey])
+	config["ignoreDict"] = createIgnoreDict(config["ignore"])
 	applyIgnore(config["ignoreDict"], config)
 
 	# If some commands need to be dispatched, do it now
 	if dispatch and len(config["dispatch"]):
-		dispatchCommand(config, args, forceDispatchResults, forceDispatchSequential)
+		with trace.span("dispatchCommand"):
+			dispatchCommand(config, args, forceDispatchResults, forceDispatchSequential)
 
 	if verbose:
 		lib.info("Modules identified: %s" % (", ".join(config["types"])))
 	return config
 
+"""
+Generate the ignore dictionary from a list of dot separated keys.
+"""
+def createIgnoreDict(ignoreList):
+	ignoreDict = {}
+	for ignore in ignoreList:
+		keyList = ignore.split(".")
+		node = lastNode = ignoreDict
+		for key in keyList:
+			lastNode = node
+			node = lastNode.setdefault(key, {})
+			if node == True:
+				break
+		lastNode[key] = True
+	return ignoreDict
+
+"""
+Remove the configuration keys matching the ignore dictionary.
+Have a specific path per module (specific to this module)
+ex: git.[...]
+"""
+def applyIgnore(ignoreDict, config):
+	for keyPattern in ignoreDict:
+		for configKey in [key for key in config.keys() if re.match(keyPattern.replace("*", ".*"), key)]:
+			if ignoreDict[keyPattern] == True:
+				del config[configKey]
+			else:
+				applyIgnore(ignoreDict[keyPattern], config[configKey])
+
 """
 Dispatch commands to nested modules if needed
 """
 def dispatchCommand(config, args, forceDispatchResults, forceDispatchSequential):
 
-	# Look for the extra arguments
+	# Look for the extra arguments, only the caller watches for changes
 	extraArgs = []
 	for index, arg in enumerate(sys.argv[1:]):
 		if arg == args.command:
-			extraArgs = sys.argv[(index + 1):]
+			extraArgs = [extraArg for extraArg in sys.argv[(index + 1):] if extraArg != "--watch"]
 			break
 
-	# Gather the output in JSON for some commands or if explcitly set
-	fetchJsonOutput = getattr(args, "json", False) or (config["caller"] and forceDispatchResults)
-
-	# Add the --json option to the arguments
-	if fetchJsonOutput and "--json" not in extraArgs:
-		extraArgs.insert(1, "--json")
+	# Wait for the results for some commands or if explcitly set
+	waitResults = getattr(args, "json", False) or forceDispatchResults
 
 	# Check if irapps is configured as a dispatcher
 	for index, rootPath in enumerate(config["dispatch"]):
-		shellCommand = [sys.executable, __file__, "--root", rootPath, "--dispatch", "%s[%i] " % (args.dispatch if args.dispatch else "", index + 1)] + extraArgs
-		if fetchJsonOutput:
-			outputRaw = lib.shell(shellCommand, capture=True)
-			try:
-				output = json.loads(" ".join(outputRaw))
-				config["dispatchResults"][rootPath] = output
-			except:
-				lib.fatal("Unable to read JSON: %s" % (" ".join(outputRaw)))
-		elif forceDispatchSequential:
-			lib.shell(shellCommand)
-		else:
-			# Run the command in parallel
-			lib.shell(shellCommand, blocking=False)
+		prefix = "%s[%i] " % (args.dispatch if args.dispatch else "", index + 1)
+		if config["dispatchMode"] == "inprocess":
+			dispatchInProcess(config, args, rootPath, prefix)
+			continue
+
+		shellCommand = [sys.executable, __file__, "--root", rootPath, "--dispatch", prefix]
+		if getattr(args, "dispatchMode", None):
+			shellCommand += ["--dispatch-mode", args.dispatchMode]
+		# Each dispatched command records its own trace, merged at the end by the caller
+		if trace.isEnabled():
+			shellCommand += ["--trace", trace.childPath(prefix)]
+		shellCommand += extraArgs
+		# Dispatched processes use the token lent by this process or take one from the jobserver
+		token = None if forceDispatchSequential else jobserver.acquire(lend=True)
+		# Keep the standard output clean if it is used to print results
+		events.spawn(config, rootPath, shellCommand, stdout=(sys.stderr if getattr(args, "json", False) else None), token=token)
+		if forceDispatchSequential and not events.wait():
+			lib.fatal("Dispatched command failed")
+
+	if waitResults and not events.wait():
+		lib.fatal("Dispatched command failed")
+
+"""
+Run the command of a subproject within this process, with its own configuration and log prefix.
+Return True if the command succeeded, failures are reported to the caller like dispatched processes.
+"""
+def dispatchInProcess(config, args, rootPath, prefix, configPath=DEFAULT_CONFIG_FILE):
+	childArgs = argparse.Namespace(**vars(args))
+	childArgs.rootPath = rootPath
+	childArgs.configPath = configPath
+	childArgs.dispatch = prefix
+	childArgs.watch = False
+
+	logPrefix = getattr(lib, "logPrefix", "")
+	stdout = sys.stdout
+	# Keep the standard output clean if it is used to print results
+	if getattr(args, "json", False):
+		sys.stdout = sys.stderr
+
+	events.push(config, rootPath, prefix)
+	trace.pushTrack("%s%s" % (prefix, os.path.realpath(rootPath)))
+	isSuccess = False
+	try:
+		with trace.span("dispatch", category="dispatch", root=rootPath):
+			commandActions[args.command](childArgs)
+		isSuccess = True
+	except SystemExit as e:
+		isSuccess = not e.code
+	except Exception as e:
+		lib.error(str(e))
+	finally:
+		# Processes dispatched by this subproject must complete before leaving its scope
+		isSuccess = events.wait() and isSuccess
+		trace.popTrack()
+		events.pop()
+		sys.stdout = stdout
+		lib.logPrefix = logPrefix
+
+	if not isSuccess:
+		events.fail("Failed to execute '%s' in '%s'" % (args.command, rootPath))
+	return isSuccess
 
 # ---- Supported actions -----------------------------------------------------
 
@@ -243,18 +367,24 @@ def dispatchCommand(config, args, forceDispatchResults, forceDispatchSequential)
 Entry point for all action mapped to the supported and enabled modules.
 """
 def action(args):
+	if getattr(args, "watch", False) and not args.dispatch:
+		return watch(args)
+
+	# When rerun by the watch mode, only the modules affected by the changes are considered
+	changedPathList = getattr(args, "changedPathList", None)
+
 	# Read the configuration
-	config = readConfig(args, dispatch=True)
+	config = readConfig(args, dispatch=(changedPathList is None))
 
 	lib.info("Running command '%s' in '%s'" % (str(args.command), str(config["root"])))
 	if args.command == "init":
-		# Clean up some directory
-		for cleanup in ["assets", "artifacts"]:
-			if os.path.isdir(config[cleanup]):
-				lib.rmtree(config[cleanup])
-				lib.mkdir(config[cleanup])
-		for moduleId in config["types"]:
-			config["pimpl"][moduleId].init()
+		if args.force:
+			# Clean up some directory
+			for cleanup in ["assets", "artifacts"]:
+				if os.path.isdir(config[cleanup]):
+					lib.rmtree(config[cleanup])
+					lib.mkdir(config[cleanup])
+		initModules(config, args.force)
 
 	elif args.command == "build":
 		allbuildTypeList = [buildType for buildType in args.configList if buildType.find(":") == -1]
@@ -267,7 +397,8 @@ def action(args):
 					lib.fatal("The module '%s' is not enabled for this configuration" % (moduleId))
 
 		buildTypesUsed = set()
-		for moduleId in config["types"]:
+		moduleList = config["types"] if changedPathList is None else getAffectedModules(config, changedPathList)
+		for moduleId in moduleList:
 
 			# Set build configuration
 			for buildType in allbuildTypeList:
@@ -278,7 +409,10 @@ def action(args):
 					if not config["dispatched"]:
 						lib.fatal("Unsupported build configuration '%s' for '%s'" % (specificbuildTypes[moduleId], moduleId))
 
-			config["pimpl"][moduleId].build(args.target)
+			with trace.span("build", module=moduleId):
+				with events.result("build", module=moduleId, target=args.target):
+					with jobserver.hold():
+						config["pimpl"][moduleId].build(args.target)
 
 		# Ensure that all build configurations have been used
 		if not config["dispatched"]:
@@ -287,7 +421,134 @@ def action(args):
 
 	elif args.command == "clean":
 		for moduleId in config["types"]:
-			config["pimpl"][moduleId].clean()
+			with trace.span("clean", module=moduleId):
+				config["pimpl"][moduleId].clean()
+
+"""
+Initialize the modules, one after the other except for the concurrent ones. A stamp of the configuration
+and tool version is kept per module, modules with a matching stamp are skipped unless forced.
+"""
+def initModules(config, force):
+	# Stamps are stored with the assets, so that they are invalidated when the assets are deleted.
+	# The assets directory can be shared by several projects, hence one file per project and module.
+	stampDirectoryPath = os.path.join(config["assets"], ".stamps")
+	if not os.path.exists(stampDirectoryPath):
+		lib.mkdir(stampDirectoryPath)
+	def getStampPath(moduleId):
+		return os.path.join(stampDirectoryPath, hashlib.sha1(("%s:%s" % (config["root"], moduleId)).encode("utf-8")).hexdigest())
+	def readStamp(moduleId):
+		try:
+			with open(getStampPath(moduleId), "r") as f:
+				return f.read()
+		except IOError:
+			return None
+
+	# If some packages are missing, all modules must be initialized again
+	missingList = getMissingPackages(config)
+	if missingList:
+		lib.info("Missing package(s): %s" % (", ".join(missingList)))
+
+	# Keys of the user configuration which are not used to initialize the modules
+	ignoredKeyList = ["tests", "start", "dispatch", "dispatchMode", "watch", "parallelism", "jobserver", "initConcurrent"]
+	version = getCurrentHash()
+	def getStamp(moduleId):
+		data = {
+			"config": config[moduleId],
+			"user": {key: value for key, value in config["userConfig"].items() if key not in ignoredKeyList},
+			"templates": config["templates"],
+			"dependencies": config["dependencies"],
+			"platform": config["platform"],
+			"version": version
+		}
+		# Non serializable values, such as callables, are identified by their type only
+		dataStr = json.dumps(data, sort_keys=True, default=lambda value: "<%s>" % (type(value).__name__))
+		return hashlib.sha1(dataStr.encode("utf-8")).hexdigest()
+
+	# Group the modules to be initialized, the concurrent ones together, the others each in their own group
+	groupList = [[]]
+	for moduleId in config["types"]:
+		stamp = getStamp(moduleId)
+		if not force and not missingList and readStamp(moduleId) == stamp:
+			lib.info("Module '%s' is up to date, skipping initialization" % (moduleId))
+		elif getattr(config["pimpl"][moduleId], "initConcurrent", False) or moduleId in config["initConcurrent"]:
+			groupList[-1].append((moduleId, stamp))
+		else:
+			groupList += [[(moduleId, stamp)], []]
+
+	lock = threading.Lock()
+	failureList = []
+	def initModule(moduleId, stamp):
+		try:
+			with trace.span("init", module=moduleId):
+				with jobserver.hold():
+					config["pimpl"][moduleId].init()
+		except BaseException as e:
+			with lock:
+				failureList.append("%s (%s)" % (moduleId, "exit code %s" % (str(e.code)) if isinstance(e, SystemExit) else str(e)))
+			return
+		with open(getStampPath(moduleId), "w") as f:
+			f.write(stamp)
+
+	for group in [group for group in groupList if group]:
+		for index in range(0, len(group), max(config["parallelism"], 1)):
+			threadList = [threading.Thread(target=initModule, args=item) for item in group[index:index + max(config["parallelism"], 1)]]
+			for thread in threadList:
+				thread.start()
+			for thread in threadList:
+				thread.join()
+		if failureList:
+			lib.fatal("Failed to initialize module(s): %s" % (", ".join(failureList)))
+
+"""
+Return the identifiers of the platform and of the distribution this machine runs, as used by the
+keys of config["dependencies"], for example ["ubuntu", "debian"].
+"""
+def getPlatformIdList(config):
+	if config["platform"] != "linux":
+		return [config["platform"]]
+	idList = []
+	try:
+		with open("/etc/os-release", "r") as f:
+			for line in f:
+				key, _, value = line.strip().partition("=")
+				if key in ["ID", "ID_LIKE"]:
+					idList += value.strip("\"'").split()
+	except IOError:
+		pass
+	return [{"rhel": "redhat"}.get(platformId, platformId) for platformId in idList]
+
+"""
+Return the list of packages from config["dependencies"] that are not installed, using a single
+query per package manager, or None if it cannot be determined. Only the dependencies of the
+platform this machine runs are considered.
+"""
+def getMissingPackages(config):
+	queries = {
+		"debian": (["dpkg-query", "-W", "-f=${Package} ${db:Status-Abbrev}\\n"], lambda line: line.split()[0] if line.split()[1:2] == ["ii"] else None),
+		"redhat": (["rpm", "-q", "--qf", "%{NAME}\\n"], lambda line: line.strip() if " " not in line.strip() else None),
+		"macos": (["brew", "list", "-1"], lambda line: line.strip())
+	}
+	queries["ubuntu"] = queries["debian"]
+	queries["fedora"] = queries["centos"] = queries["redhat"]
+
+	platformIdList = getPlatformIdList(config)
+	missingList = None
+	for key, packageList in config["dependencies"].items():
+		if key not in queries or key not in platformIdList or not packageList:
+			continue
+		command, parseLine = queries[key]
+		# brew lists all packages installed, the other package managers only the ones requested
+		if key != "macos":
+			command = command + packageList
+		try:
+			proc = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+			output = proc.communicate()[0]
+		except OSError:
+			# This package manager is not available on this machine
+			continue
+		installedSet = set([parseLine(line) for line in output.splitlines() if line.strip()])
+		missingList = (missingList or []) + [package for package in packageList if package not in installedSet]
+	return missingList
 
 """
 Application/command related actions
@@ -326,12 +587,57 @@ def commands(args):
 			for appId in idList:
 				config["pimpl"][moduleId].stop(None if appId == "all" else appId)
 
+"""
+This function prints a formated table
+"""
+def printTable(headerList, rowList, indent=0):
+	# Calculate teh cell lengths
+	cells = {header["key"]: [len(header["name"]), False] for header in headerList}
+	for build in rowList:
+		for header in headerList:
+			if header["key"] in build:
+				build[header["key"]] = str(header["formater"](build[header["key"]])) if "formater" in header else str(build[header["key"]])
+				if build[header["key"]] != "":
+					cells[header["key"]] = [max(cells[header["key"]][0], len(build[header["key"]])), True]
+	# Print the header
+	lib.info("%*s%s" % (indent, "", " ".join(["%-*s " % (cells[header["key"]][0], header["name"]) for header in headerList if cells[header["key"]][1]])))
+	# Print the table
+	for build in rowList:
+		lib.info("%*s%s" % (indent, "", " ".join(["%-*s " % (cells[header["key"]][0], str(build[header["key"]]) if header["key"] in build else "") for header in headerList if cells[header["key"]][1]])))
+
+"""
+Special cell formaters
+"""
+def formaterBool(value):
+	return "x" if value else ""
+
+def formaterMemory(memBytes):
+	if not memBytes and memBytes != 0:
+		return "-"
+	unitIndex = 0
+	unitList = ["B", "kB", "MB", "GB", "TB"]
+	while memBytes > 768:
+		unitIndex += 1
+		memBytes /= 1024
+	return "%.1f%s" % (memBytes, unitList[unitIndex])
+
+def formaterTime(timeS):
+	if not timeS and timeS != 0:
+		return "-"
+	strList = []
+	for check in [[3600 * 24, " day", " days"], [3600, "h", "h"], [60, "m", "m"], [1, "s", "s"]]:
+		if timeS >= check[0]:
+			unit = int(timeS / check[0])
+			strList.append("%i%s" % (unit, check[1] if unit > 1 else check[2]))
+			timeS -= unit * check[0]
+	return " ".join(strList[:2]) or "0s"
+
 """
 Print information regarding the program and loaded modules
 """
 def info(args):
 
-	verbose = not args.json
+	verbose = not args.json and not events.isEnabled()
 
 	# Read the configuration
 	config = readConfig(args, verbose, dispatch=True, forceDispatchResults=True)
@@ -345,49 +651,6 @@ def info(args):
 	printApps = True if printAll or args.apps else False
 	printModules = True if printAll else False
 
-	"""
-	This function prints a formated table
-	"""
-	def printTable(headerList, rowList, indent=0):
-		# Calculate teh cell lengths
-		cells = {header["key"]: [len(header["name"]), False] for header in headerList}
-		for build in rowList:
-			for header in headerList:
-				if header["key"] in build:
-					build[header["key"]] = str(header["formater"](build[header["key"]])) if "formater" in header else str(build[header["key"]])
-					if build[header["key"]] != "":
-						cells[header["key"]] = [max(cells[header["key"]][0], len(build[header["key"]])), True]
-		# Print the header
-		lib.info("%*s%s" % (indent, "", " ".join(["%-*s " % (cells[header["key"]][0], header["name"]) for header in headerList if cells[header["key"]][1]])))
-		# Print the table
-		for build in rowList:
-			lib.info("%*s%s" % (indent, "", " ".join(["%-*s " % (cells[header["key"]][0], str(build[header["key"]]) if header["key"] in build else "") for header in headerList if cells[header["key"]][1]])))
-
-	"""
-	Special cell formaters
-	"""
-	def formaterBool(value):
-		return "x" if value else ""
-	def formaterMemory(memBytes):
-		if not memBytes and memBytes != 0:
-			return "-"
-		unitIndex = 0
-		unitList = ["B", "kB", "MB", "GB", "TB"]
-		while memBytes > 768:
-			unitIndex += 1
-			memBytes /= 1024
-		return "%.1f%s" % (memBytes, unitList[unitIndex])
-	def formaterTime(timeS):
-		if not timeS and timeS != 0:
-			return "-"
-		strList = []
-		for check in [[3600 * 24, " day", " days"], [3600, "h", "h"], [60, "m", "m"], [1, "s", "s"]]:
-			if timeS >= check[0]:
-				unit = int(timeS / check[0])
-				strList.append("%i%s" % (unit, check[1] if unit > 1 else check[2]))
-				timeS -= unit * check[0]
-		return " ".join(strList[:2]) or "0s"
-
 	if printAll:
 		info["hash"] = str(getCurrentHash())
 		if verbose:
@@ -404,15 +667,18 @@ def info(args):
 			# Update default attribute
 			for buildType, build in moduleBuilds.items():
 				build["default"] = True if config["pimpl"][moduleId].getDefaultBuildType() == buildType else False
+				events.emit("buildConfig", id="%s:%s" % (moduleId, buildType), build=build)
 			info["builds"].update({"%s:%s" % (moduleId, key) : build for key, build in moduleBuilds.items()})
 			# ---- targets ----------------------------------------------------
-			info["targets"] = list(set(info["targets"] + (info[moduleId]["targets"] if "targets" in info[moduleId] else [])))
+			moduleTargets = info[moduleId]["targets"] if "targets" in info[moduleId] else []
+			for target in moduleTargets:
+				events.emit("target", target=target)
+			info["targets"] = list(set(info["targets"] + moduleTargets))
 
 		# Merge the dispatched layers
 		for key, dispatch in config["dispatchResults"].items():
-			if "builds" in dispatch:
-				info["builds"].update(dispatch["builds"])
-				info["targets"] = list(set(info["targets"] + dispatch["targets"]))
+			info["builds"].update(dispatch.get("builds", {}))
+			info["targets"] = list(set(info["targets"] + dispatch.get("targets", [])))
 
 		# Print the list
 		if verbose:
@@ -434,10 +700,12 @@ def info(args):
 	if printApps:
 		info["statusList"] = []
 		for moduleId in config["types"]:
-			info["statusList"] += config["pimpl"][moduleId].getStatusList()
+			for status in config["pimpl"][moduleId].getStatusList():
+				events.emit("status", status=status)
+				info["statusList"].append(status)
 		# Merge results from dispatched layers
 		for key, dispatch in config["dispatchResults"].items():
-			for status in dispatch["statusList"]:
+			for status in dispatch.get("statusList", []):
 				if not any(x for x in info["statusList"] if x["pid"] == status["pid"]):
 					info["statusList"].append(status)
 
@@ -454,8 +722,14 @@ def info(args):
 					{"key": "restart", "name": "Restart"},
 					{"key": "log", "name": "Log"}], info["statusList"], indent=3)
 
+	# Send the remaining information to the caller, the builds, targets and status have been sent one by one
+	if events.isEnabled():
+		summary = {key: value for key, value in info.items() if key != "dispatchResults"}
+		summary.update({key: type(info[key])() for key in ["builds", "targets", "statusList"] if key in info})
+		events.emit("info", info=summary)
+
 	# Print the output in JSON format
-	if not verbose:
+	elif args.json:
 		print(json.dumps(info))
 
 """
@@ -478,57 +752,217 @@ def run(args, verboseConfig=True):
 	# Define the number of jobs
 	nbJobs = args.nbJobs if args.nbJobs > 0 else config["parallelism"]
 
-	optionsStrList = []
-	if nbJobs > 1:
-		optionsStrList.append("%i jobs" % (nbJobs))
-	if totalIterations > 1:
-		optionsStrList.append("%i iterations" % (totalIterations))
-	elif totalIterations == 0:
-		optionsStrList.append("endless mode")
-	if args.duration:
-		optionsStrList.append("%is" % (args.duration))
-	if isAutoTimeout:
-		optionsStrList.append("timeout auto")
-	elif timeout > 0:
-		optionsStrList.append("%is timeout" % (timeout))
-	optionsStr = " [%s]" % (", ".join(optionsStrList)) if len(optionsStrList) else ""
-
-	if len(commandList) == 1:
-		lib.info("Running command '%s'%s" % (" ".join(commandList[0]), optionsStr))
-	elif len(commandList) > 1:
-		lib.info("Running commands %s%s" % (", ".join([("'" + " ".join(cmd) + "'") for cmd in commandList]), optionsStr))
-	else:
-		lib.fatal("No command was executed")
-
-	# Pre run the supported modules
-	for moduleId in config["types"]:
-		config["pimpl"][moduleId].runPre(commandList)
-
-	verbose = (totalIterations == 1) or args.verbose
+	# Run jobs in parallel endlessly until one of them fails
+	isFailFast = args.failFast
+	if args.untilFailure:
+		isFailFast = True
+		totalIterations = 0
 
+	# The first job uses the token of this process, or one from the jobserver while it is lent to a
+	# dispatched process. The others take one from the jobserver if available. The tokens must be given
+	# back however the run ends, as dispatched subprojects might be waiting for them.
+	tokenList = []
 	try:
-		lib.shellMulti(commandList,
-				# This must stay root directory it is critical to make dispath feature work with tests
-				cwd=config["root"],
-				nbIterations=totalIterations,
-				isAutoTimeout=isAutoTimeout,
-				verbose=verbose,
-				timeout=timeout,
-				duration=args.duration,
-				nbJobs=nbJobs)
-	except:
-		sys.exit(1)
+		tokenList.append(jobserver.acquire(lend=True))
+		while len(tokenList) < nbJobs:
+			token = jobserver.acquire(timeout=0)
+			if token is None:
+				break
+			tokenList.append(token)
+		if len(tokenList) < nbJobs:
+			lib.info("Limited to %i of the %i job(s) requested by the jobserver" % (len(tokenList), nbJobs))
+		nbJobs = len(tokenList)
+
+		optionsStrList = []
+		if nbJobs > 1:
+			optionsStrList.append("%i jobs" % (nbJobs))
+		if totalIterations > 1:
+			optionsStrList.append("%i iterations" % (totalIterations))
+		elif totalIterations == 0:
+			optionsStrList.append("endless mode")
+		if args.duration:
+			optionsStrList.append("%is" % (args.duration))
+		if isAutoTimeout:
+			optionsStrList.append("timeout auto")
+		elif timeout > 0:
+			optionsStrList.append("%is timeout" % (timeout))
+		if args.untilFailure:
+			optionsStrList.append("until failure")
+		elif isFailFast:
+			optionsStrList.append("fail fast")
+		optionsStr = " [%s]" % (", ".join(optionsStrList)) if len(optionsStrList) else ""
+
+		if len(commandList) == 1:
+			lib.info("Running command '%s'%s" % (" ".join(commandList[0]), optionsStr))
+		elif len(commandList) > 1:
+			lib.info("Running commands %s%s" % (", ".join([("'" + " ".join(cmd) + "'") for cmd in commandList]), optionsStr))
+		else:
+			lib.fatal("No command was executed")
 
-	# Post run the supported modules
-	for moduleId in config["types"]:
-		config["pimpl"][moduleId].runPost(commandList)
+		# Pre run the supported modules
+		for moduleId in config["types"]:
+			config["pimpl"][moduleId].runPre(commandList)
+
+		verbose = (totalIterations == 1) or args.verbose
+
+		try:
+			shellMulti = shellMultiFailFast if isFailFast else lib.shellMulti
+			with trace.span(shellMulti.__name__, commands=[" ".join(cmd) for cmd in commandList]):
+				with events.result("run", commands=[" ".join(cmd) for cmd in commandList]):
+					shellMulti(commandList,
+							# This must stay root directory it is critical to make dispath feature work with tests
+							cwd=config["root"],
+							nbIterations=totalIterations,
+							isAutoTimeout=isAutoTimeout,
+							verbose=verbose,
+							timeout=timeout,
+							duration=args.duration,
+							nbJobs=nbJobs)
+		except:
+			sys.exit(1)
+
+		# Post run the supported modules
+		for moduleId in config["types"]:
+			config["pimpl"][moduleId].runPost(commandList)
+	finally:
+		for token in tokenList:
+			jobserver.release(token)
+
+"""
+Execute the commands like lib.shellMulti, but the first failure cancels all other jobs in flight
+and stops scheduling new iterations. Only the output of the failing job is kept.
+"""
+def shellMultiFailFast(commandList, cwd=".", nbIterations=1, isAutoTimeout=False, verbose=False, timeout=0, duration=0, nbJobs=1):
+	lock = threading.Lock()
+	stop = threading.Event()
+	procList = set()
+	state = {"next": 0, "completed": 0, "maxDuration": 0, "failure": None}
+	timeStart = time.time()
+
+	# Return the next job to be executed as a tuple (iteration, command) or None if there are no more
+	def nextJob():
+		with lock:
+			if stop.is_set() or (duration and time.time() - timeStart >= duration):
+				return None
+			if nbIterations and state["next"] >= nbIterations * len(commandList):
+				return None
+			index = state["next"]
+			state["next"] += 1
+			return (int(index / len(commandList)) + 1, commandList[index % len(commandList)])
+
+	def fail(failure):
+		with lock:
+			if state["failure"]:
+				return
+			state["failure"] = failure
+			stop.set()
+			cancelList = list(procList)
+		# Cancel all other jobs in flight
+		threadList = [threading.Thread(target=terminateProcess, args=(proc, )) for proc in cancelList]
+		for thread in threadList:
+			thread.start()
+		for thread in threadList:
+			thread.join()
+
+	# Execute a job, return False if no other job should be scheduled
+	def runJob(iteration, command):
+		jobStart = time.time()
+		outputList = []
+		errorMsgList = []
+
+		try:
+			proc = subprocess.Popen(command, cwd=cwd, shell=False, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, **jobserver.popenArgs())
+		except OSError as e:
+			fail({"iteration": iteration, "command": command, "output": [], "reason": str(e)})
+			return False
+
+		with lock:
+			procList.add(proc)
+		# The failure might have been registered before the process was added to the list
+		if stop.is_set():
+			terminateProcess(proc)
+
+		def readOutput():
+			for line in iter(proc.stdout.readline, b''):
+				line = line.rstrip().decode('utf-8', 'replace')
+				outputList.append(line)
+				if verbose:
+					sys.stdout.write("%s\n" % (line))
+					sys.stdout.flush()
+			proc.stdout.close()
+		outputThread = threading.Thread(target=readOutput)
+		outputThread.start()
+
+		# Before the first successful job, there is no reference for the automatic timeout
+		jobTimeout = (state["maxDuration"] * 3 if isAutoTimeout else timeout)
+		timer = None
+		if jobTimeout:
+			def processTimeout():
+				errorMsgList.append("timeout=%.1fs" % (jobTimeout))
+				terminateProcess(proc)
+			timer = threading.Timer(jobTimeout, processTimeout)
+			timer.start()
+		try:
+			proc.wait()
+			outputThread.join()
+		finally:
+			if timer:
+				timer.cancel()
+		with lock:
+			procList.discard(proc)
+
+		if proc.returncode != 0 or errorMsgList:
+			# Cancelled by the failure of another job
+			if stop.is_set():
+				return False
+			errorMsgList.append("return.code=%s" % (str(proc.returncode)))
+			fail({"iteration": iteration, "command": command, "output": outputList, "reason": ", ".join(errorMsgList)})
+			return False
+
+		with lock:
+			state["completed"] += 1
+			state["maxDuration"] = max(state["maxDuration"], time.time() - jobStart)
+		return True
+
+	# Each worker runs with one of the job tokens held by the caller
+	def worker():
+		while True:
+			job = nextJob()
+			if not job or not runJob(*job):
+				return
+
+	threadList = [threading.Thread(target=worker) for i in range(max(nbJobs, 1))]
+	for thread in threadList:
+		thread.start()
+	for thread in threadList:
+		thread.join()
+
+	failure = state["failure"]
+	if failure:
+		if not verbose:
+			for line in failure["output"]:
+				sys.stdout.write("%s\n" % (line))
+			sys.stdout.flush()
+		message = "Failed to execute '%s' in '%s' at iteration %i after %i successful job(s): %s" % (" ".join(failure["command"]),
+				str(cwd), failure["iteration"], state["completed"], failure["reason"])
+		lib.error(message)
+		raise Exception(message)
+
+	lib.info("%i job(s) completed in %.1fs" % (state["completed"], time.time() - timeStart))
 
 """
 Shortcut to run the predefined tests
 """
 def test(args):
+	if getattr(args, "watch", False) and not args.dispatch:
+		return watch(args)
+
+	# When rerun by the watch mode, only the tests mapped to the modules affected by the changes are considered
+	changedPathList = getattr(args, "changedPathList", None)
+
 	# Read the configuration
-	config = readConfig(args, verbose=True, dispatch=True)
+	config = readConfig(args, verbose=True, dispatch=(changedPathList is None))
+	testTypeList = None if changedPathList is None else getAffectedTests(config, getAffectedModules(config, changedPathList))
 
 	def isValid(name, filterList):
 		for filt in filterList:
@@ -537,19 +971,23 @@ def test(args):
 		return True if len(filterList) == 0 else False
 
 	commandList = []
+	testList = []
 	for typeIds, pathList in config["tests"].items():
+		if testTypeList is not None and typeIds not in testTypeList:
+			continue
 		for path in pathList:
 			if isValid(typeIds.lower(), args.filter) or isValid(path.lower(), args.filter):
 				for name in ["test", "run"]:
 					execTest = lib.getCommand(config, name, "%s.%s" % (config["platform"], typeIds), {"path": lib.path(path)})
 					if execTest:
 						commandList.append(execTest)
+						testList.append({"type": typeIds, "path": path})
 						break
 
 	# Ensure there is at least one command
 	if len(commandList) == 0:
-		# Gracefully exit in case this is a dispatched command
-		if config["dispatched"]:
+		# Gracefully exit in case this is a dispatched command or if no test is affected by the changes
+		if config["dispatched"] or changedPathList is not None:
 			return
 		else:
 			lib.fatal("There are no valid test%s" % (" or none are matching with %s" % ", ".join(["'%s'" % (filt) for filt in args.filter]) if args.filter else ""))
@@ -557,7 +995,145 @@ def test(args):
 	# Tweak the arguments to be compatible with the run command
 	setattr(args, "commandList", commandList)
 	setattr(args, "args", None)
-	run(args, verboseConfig=False)
+	# The tests are run together, hence a single result for all of them
+	with events.result("test", tests=testList):
+		run(args, verboseConfig=False)
+
+"""
+Keep running the command each time the files of the project or of its dispatched subprojects change.
+Only the modules affected by the changes, or the tests mapped to them, are considered.
+"""
+def watch(args):
+	if not sys.platform.startswith("linux"):
+		lib.fatal("Watch mode is only supported on Linux")
+
+	args = argparse.Namespace(**vars(args))
+	args.watch = False
+
+	# Run everything a first time
+	try:
+		commandActions[args.command](args)
+	except SystemExit:
+		pass
+	events.wait()
+
+	config = readConfig(args, verbose=False)
+	projectList, ignorePathList = getProjectList(config["root"], config["dispatch"], args.dispatch if args.dispatch else "")
+	ignoreList = [".irapp", ".git", "node_modules", "__pycache__"] + config["watch"].get("ignore", [])
+	ignorePathList += [os.path.realpath(config[key]) for key in ["assets", "artifacts", "log"]]
+
+	# Return the deepest project containing the path, if any
+	def getProject(path):
+		projectMatchList = [project for project in projectList if path == project[0] or path.startswith(project[0] + os.sep)]
+		return max(projectMatchList, key=lambda project: len(project[0])) if projectMatchList else None
+
+	# The patterns only apply within the project, the directories above its root do not matter
+	def isIgnored(path):
+		if any(path == ignorePath or path.startswith(ignorePath + os.sep) for ignorePath in ignorePathList):
+			return True
+		project = getProject(path)
+		if not project or path == project[0]:
+			return False
+		return any(fnmatch.fnmatch(name, pattern) for name in os.path.relpath(path, project[0]).split(os.sep) for pattern in ignoreList)
+
+	# Content digest of the files as of their last reported change, files rewritten with the same
+	# content, typically by the rerun itself, are not considered as changed.
+	digestDict = {}
+	def isModified(path):
+		digest = None
+		if os.path.isfile(path):
+			hashObject = hashlib.sha1()
+			try:
+				with open(path, "rb") as f:
+					for chunk in iter(lambda: f.read(65536), b""):
+						hashObject.update(chunk)
+				digest = hashObject.hexdigest()
+			except (IOError, OSError):
+				pass
+		if path in digestDict and digestDict[path] == digest:
+			return False
+		digestDict[path] = digest
+		return True
+
+	notifier = inotify(isIgnored)
+	try:
+		for rootPath, prefix in projectList:
+			notifier.addTree(rootPath)
+			for root, dirs, files in os.walk(rootPath):
+				dirs[:] = [name for name in dirs if not isIgnored(os.path.join(root, name))]
+				for path in [os.path.join(root, name) for name in files]:
+					if path not in digestDict and not isIgnored(path):
+						isModified(path)
+		lib.info("Watching %i project(s) for changes, press Ctrl+C to stop" % (len(projectList)))
+
+		while True:
+			changedPathList = [path for path in notifier.wait(config["watch"].get("debounce", 0.3)) if isModified(path)]
+
+			# Associate each change with the deepest project containing it
+			changesPerProject = {}
+			for path in changedPathList:
+				project = getProject(path)
+				if project and path != project[0]:
+					changesPerProject.setdefault(project, []).append(path)
+
+			for (rootPath, prefix), pathList in sorted(changesPerProject.items()):
+				lib.info("%sChange(s) detected in '%s': %s" % (prefix, rootPath, ", ".join([os.path.relpath(path, rootPath) for path in pathList])))
+				args.changedPathList = pathList
+				isRoot = (rootPath == config["root"])
+				dispatchInProcess(config, args, args.rootPath if isRoot else rootPath, prefix, args.configPath if isRoot else DEFAULT_CONFIG_FILE)
+			events.wait()
+
+	except KeyboardInterrupt:
+		lib.info("Stopped watching")
+	finally:
+		notifier.close()
+
+"""
+Return the list of projects as tuples (root path, log prefix), including the dispatched subprojects,
+and the list of the assets, artifacts and log directories of the subprojects.
+"""
+def getProjectList(rootPath, dispatchList, prefix):
+	projectList = [(os.path.realpath(rootPath), prefix)]
+	ignorePathList = []
+	for index, subRootPath in enumerate(dispatchList):
+		try:
+			with open(os.path.join(subRootPath, DEFAULT_CONFIG_FILE), "r") as f:
+				subConfig = json.load(f)
+		except (IOError, ValueError):
+			subConfig = {}
+		ignorePathList += [os.path.realpath(os.path.join(subRootPath, subConfig.get(key, default)))
+				for key, default in [("assets", ASSETS_DIRECTORY_PATH), ("artifacts", ARTIFACTS_DIRECTORY_PATH), ("log", LOG_DIRECTORY_PATH)]]
+		subProjectList, subIgnorePathList = getProjectList(subRootPath, subConfig.get("dispatch", []), "%s[%i] " % (prefix, index + 1))
+		projectList += subProjectList
+		ignorePathList += subIgnorePathList
+	return projectList, ignorePathList
+
+"""
+Return the modules affected by the changed paths.
+"""
+def getAffectedModules(config, pathList):
+	moduleDescs = config["watch"].get("modules", {})
+	def isAffected(moduleId):
+		if moduleId not in moduleDescs or "patterns" not in moduleDescs[moduleId]:
+			return True
+		for path in pathList:
+			relativePath = os.path.relpath(path, config["root"])
+			if any(fnmatch.fnmatch(relativePath, pattern) or fnmatch.fnmatch(os.path.basename(path), pattern) for pattern in moduleDescs[moduleId]["patterns"]):
+				return True
+		return False
+	return [moduleId for moduleId in config["types"] if isAffected(moduleId)]
+
+"""
+Return the test types mapped to the modules, or None if all tests are concerned.
+"""
+def getAffectedTests(config, moduleList):
+	moduleDescs = config["watch"].get("modules", {})
+	testTypeList = set()
+	for moduleId in moduleList:
+		if moduleId not in moduleDescs or "tests" not in moduleDescs[moduleId]:
+			return None
+		testTypeList.update(moduleDescs[moduleId]["tests"])
+	return testTypeList
 
 """
 Return the current hash or None if not available
@@ -654,8 +1230,617 @@ def update(args):
 		for change in changeList:
 			lib.info("- %s" % (change))
 
+# ---- Tracing ----------------------------------------------------------------
+
+"""
+Record timed spans and save them in the Chrome trace-event format (viewable in Perfetto).
+When tracing is disabled, span() returns a shared no-op context manager.
+"""
+class trace:
+	path = None
+	pid = None
+	pidList = []
+	trackCount = 0
+	eventList = []
+	childPathList = []
+	lock = threading.Lock()
+
+	class NullSpan(object):
+		def __enter__(self):
+			return self
+		def __exit__(self, excType, excValue, excTraceback):
+			return False
+
+	class Span(object):
+		def __init__(self, name, category, args):
+			self.name = name
+			self.category = category
+			self.args = args
+		def __enter__(self):
+			self.start = time.time()
+			return self
+		def __exit__(self, excType, excValue, excTraceback):
+			if excType:
+				self.args["error"] = str(excValue) if excValue is not None else excType.__name__
+			trace.add(self.name, self.category, self.start, time.time(), self.args)
+			return False
+
+	nullSpan = NullSpan()
+
+	"""
+	Start recording, all events from this process are grouped on a track with the given name.
+	"""
+	@staticmethod
+	def enable(path, name):
+		trace.path = os.path.realpath(path)
+		trace.pid = os.getpid()
+		trace.eventList = [{"name": "process_name", "ph": "M", "pid": trace.pid, "tid": 0, "args": {"name": name}}]
+		trace.childPathList = []
+
+	@staticmethod
+	def isEnabled():
+		return trace.path is not None
+
+	"""
+	Group the following events on a new track, used by in-process dispatched commands.
+	"""
+	@staticmethod
+	def pushTrack(name):
+		if trace.path is None:
+			return
+		trace.trackCount += 1
+		trace.pidList.append(trace.pid)
+		trace.pid = os.getpid() * 1000 + trace.trackCount
+		trace.eventList.append({"name": "process_name", "ph": "M", "pid": trace.pid, "tid": 0, "args": {"name": name}})
+
+	@staticmethod
+	def popTrack():
+		if trace.path is None:
+			return
+		trace.pid = trace.pidList.pop()
+
+	@staticmethod
+	def span(name, category="irapp", **args):
+		if trace.path is None:
+			return trace.nullSpan
+		return trace.Span(name, category, args)
+
+	@staticmethod
+	def add(name, category, start, end, args):
+		event = {
+			"name": name,
+			"cat": category,
+			"ph": "X",
+			"ts": int(start * 1000000),
+			"dur": int((end - start) * 1000000),
+			"pid": trace.pid,
+			"tid": threading.current_thread().ident,
+			"args": args
+		}
+		with trace.lock:
+			trace.eventList.append(event)
+
+	"""
+	Path of the trace file to be written by a dispatched process, it will be merged on save.
+	It is derived from the dispatch prefix, which is unique even among in-process subprojects.
+	"""
+	@staticmethod
+	def childPath(prefix):
+		path = "%s.%s" % (trace.path, ".".join(re.findall(r"\d+", prefix)))
+		trace.childPathList.append(path)
+		return path
+
+	"""
+	Wrap the shell function of the library to record a span for each spawned command.
+	"""
+	@staticmethod
+	def instrument(libInstance):
+		if trace.path is None or getattr(libInstance.shell, "isTraced", False):
+			return
+		shell = libInstance.shell
+		def tracedShell(command, *args, **kwargs):
+			with trace.span(os.path.basename(str(command[0])), category="shell", command=" ".join([str(arg) for arg in command]), cwd=kwargs.get("cwd", ".")):
+				return shell(command, *args, **kwargs)
+		tracedShell.isTraced = True
+		setattr(libInstance, "shell", staticmethod(tracedShell) if isinstance(libInstance, type) else tracedShell)
+
+	"""
+	Merge the traces from the dispatched processes and write the trace file.
+	"""
+	@staticmethod
+	def save():
+		if trace.path is None:
+			return
+		eventList = list(trace.eventList)
+		for path in trace.childPathList:
+			try:
+				with open(path, "r") as f:
+					eventList += json.load(f)["traceEvents"]
+				os.remove(path)
+			except (IOError, OSError, ValueError) as e:
+				lib.warning("Could not merge trace '%s': %s" % (path, e))
+		with open(trace.path, "w") as f:
+			json.dump({"traceEvents": eventList, "displayTimeUnit": "ms"}, f)
+
+# ---- Dispatch events --------------------------------------------------------
+
+"""
+Line-delimited JSON events sent by a dispatched process to its caller. They go through a dedicated
+file descriptor, separated from the log output, and are merged by the caller as they arrive.
+"""
+class events:
+	output = None
+	root = None
+	prefix = ""
+	scopeList = []
+	lock = threading.Lock()
+	# Dispatched commands being processed and failures of this process, outside of in-process scopes
+	rootScope = {"threadList": [], "failureList": []}
+
+	class Result(object):
+		def __init__(self, kind, data):
+			self.kind = kind
+			self.data = data
+		def __enter__(self):
+			self.start = time.time()
+			return self
+		def __exit__(self, excType, excValue, excTraceback):
+			events.emit(self.kind, success=(excType is None), duration=(time.time() - self.start), **self.data)
+			return False
+
+	"""
+	Send the events of this process to the caller through this file descriptor.
+	"""
+	@staticmethod
+	def enable(fd, root, prefix):
+		events.output = os.fdopen(fd, "w")
+		events.root = root
+		events.prefix = prefix
+
+	@staticmethod
+	def isEnabled():
+		return events.output is not None or len(events.scopeList) > 0
+
+	"""
+	Send the events to the caller within this process, used by in-process dispatched commands.
+	The root path is the one configured by the caller, it identifies the subproject in its results.
+	"""
+	@staticmethod
+	def push(config, rootPath, prefix):
+		events.scopeList.append({"config": config, "rootPath": rootPath, "root": os.path.realpath(rootPath), "prefix": prefix,
+				"threadList": [], "failureList": []})
+
+	@staticmethod
+	def pop():
+		events.scopeList.pop()
+
+	"""
+	Return the scope of the given in-process dispatch level, level 0 being this process. The dispatched
+	commands and the failures are tracked per scope, so that a subproject only waits for its own.
+	"""
+	@staticmethod
+	def getScope(level):
+		return events.scopeList[level - 1] if level > 0 else events.rootScope
+
+	@staticmethod
+	def emit(kind, **data):
+		if not events.isEnabled():
+			return
+		scope = events.scopeList[-1] if events.scopeList else {"root": events.root, "prefix": events.prefix}
+		data.update({"event": kind, "root": scope["root"], "prefix": scope["prefix"]})
+		events.forward(data, len(events.scopeList))
+
+	"""
+	Send an event to the caller of the given in-process dispatch level, level 0 being this process.
+	"""
+	@staticmethod
+	def forward(event, level):
+		if level > 0:
+			events.receive(events.scopeList[level - 1]["config"], events.scopeList[level - 1]["rootPath"], event, level - 1)
+		elif events.output is not None:
+			events.write(event)
+
+	@staticmethod
+	def write(event):
+		line = json.dumps(event) + "\n"
+		with events.lock:
+			events.output.write(line)
+			events.output.flush()
+
+	"""
+	Emit a result event with the outcome and the duration of the enclosed block.
+	"""
+	@staticmethod
+	def result(kind, **data):
+		if not events.isEnabled():
+			return trace.nullSpan
+		return events.Result(kind, data)
+
+	"""
+	Spawn a dispatched command and process its events in the background.
+	The events file descriptor option is inserted right after the script path.
+	"""
+	@staticmethod
+	def spawn(config, rootPath, command, stdout=None, token=None):
+		output = stdout if stdout else sys.stdout
+		if os.name == "nt":
+			# File descriptors cannot be passed on Windows, the events are multiplexed with the standard output
+			proc = subprocess.Popen(command[:2] + ["--events-fd", "1"] + command[2:], stdout=subprocess.PIPE, universal_newlines=True)
+			stream = proc.stdout
+		else:
+			readFd, writeFd = os.pipe()
+			try:
+				proc = subprocess.Popen(command[:2] + ["--events-fd", str(writeFd)] + command[2:], stdout=stdout,
+						**({"pass_fds": [writeFd] + jobserver.fdList} if sys.version_info[0] >= 3 else {}))
+			except:
+				os.close(readFd)
+				jobserver.release(token)
+				raise
+			finally:
+				os.close(writeFd)
+			stream = os.fdopen(readFd, "r")
+
+		thread = threading.Thread(target=events.read, args=(config, rootPath, len(events.scopeList), stream, proc, command, output, token))
+		thread.start()
+		events.getScope(len(events.scopeList))["threadList"].append(thread)
+
+	@staticmethod
+	def read(config, rootPath, level, stream, proc, command, output, token):
+		timeStart = time.time()
+		for line in iter(stream.readline, ""):
+			try:
+				event = json.loads(line)
+				if not isinstance(event, dict) or "event" not in event:
+					raise ValueError("not an event")
+			except ValueError:
+				output.write(line)
+				output.flush()
+				continue
+			events.receive(config, rootPath, event, level)
+		stream.close()
+		proc.wait()
+		jobserver.release(token)
+
+		if trace.isEnabled():
+			trace.add("dispatch", "dispatch", timeStart, time.time(), {"command": " ".join(command), "returncode": proc.returncode})
+		if proc.returncode != 0:
+			events.fail("Failed to execute '%s': return.code=%s" % (" ".join(command), str(proc.returncode)), level)
+
+	@staticmethod
+	def fail(message, level=None):
+		with events.lock:
+			events.getScope(len(events.scopeList) if level is None else level)["failureList"].append(message)
+
+	"""
+	Process an event sent by the subproject dispatched with this root path, or by one of its own
+	subprojects. The event is tagged with the root path of each level it goes through.
+	"""
+	@staticmethod
+	def receive(config, rootPath, event, level):
+		event = dict(event, dispatchPath=[rootPath] + event.get("dispatchPath", []))
+		# Forward the event to the caller if any
+		events.forward(event, level)
+		with events.lock:
+			events.merge(config["dispatchResults"], event)
+
+		# Show the progress
+		if level == 0 and events.output is None and event["event"] in ["build", "test", "run"]:
+			name = {"build": event.get("module"), "test": ", ".join([test["path"] for test in event.get("tests", [])]),
+					"run": ", ".join(event.get("commands", []))}[event["event"]]
+			# In-process dispatched commands are already logged with their prefix
+			logPrefix = getattr(lib, "logPrefix", "") or ""
+			prefix = event["prefix"][len(logPrefix):] if event["prefix"].startswith(logPrefix) else event["prefix"]
+			lib.info("%s%s '%s' %s (%.1fs)" % (prefix, event["event"].capitalize(), name,
+					"succeeded" if event["success"] else "failed", event["duration"]))
+
+	"""
+	Merge an event into the dispatch results, which are nested per subproject as in the information
+	of each subproject. The builds, targets and status of a subproject include the ones of its own
+	subprojects.
+	"""
+	@staticmethod
+	def merge(dispatchResults, event):
+		kind = event["event"]
+		for index, rootPath in enumerate(event["dispatchPath"]):
+			results = dispatchResults.setdefault(rootPath, {"dispatchResults": {}})
+			dispatchResults = results["dispatchResults"]
+			if kind == "status":
+				results.setdefault("statusList", []).append(event["status"])
+			elif kind == "buildConfig":
+				results.setdefault("builds", {})[event["id"]] = event["build"]
+			elif kind == "target":
+				if event["target"] not in results.setdefault("targets", []):
+					results["targets"].append(event["target"])
+			# Other events only concern the subproject which sent them
+			elif index < len(event["dispatchPath"]) - 1:
+				continue
+			elif kind == "info":
+				for key, value in event["info"].items():
+					results.setdefault(key, value)
+			else:
+				results.setdefault("%sResults" % (kind), []).append({key: value for key, value in event.items() if key not in ["event", "root", "prefix", "dispatchPath"]})
+
+	"""
+	Wait until all commands dispatched within the current scope are completed, return False if any of them failed.
+	"""
+	@staticmethod
+	def wait():
+		scope = events.getScope(len(events.scopeList))
+		while scope["threadList"]:
+			scope["threadList"].pop(0).join()
+		with events.lock:
+			failureList = scope["failureList"][:]
+			del scope["failureList"][:]
+		for message in failureList:
+			lib.error(message)
+		return len(failureList) == 0
+
+# ---- Jobserver --------------------------------------------------------------
+
+"""
+Pool of job tokens shared by the whole process tree, compatible with the GNU make jobserver protocol.
+Each process owns an implicit token, the extra ones are read from and written back to a pipe
+advertised through MAKEFLAGS, so that dispatched processes and build tools spawned by the modules join.
+"""
+class jobserver:
+	readFd = None
+	writeFd = None
+	# Descriptors of the jobserver to be passed to the spawned processes
+	fdList = []
+	size = None
+	pressure = {}
+	isSetup = False
+	# The implicit token of this process can be lent to one dispatched process at a time
+	lent = threading.Semaphore(1)
+	LENT_TOKEN = object()
+
+	class Token(object):
+		def __enter__(self):
+			self.token = jobserver.acquire(lend=True)
+			return self
+		def __exit__(self, excType, excValue, excTraceback):
+			jobserver.release(self.token)
+			return False
+
+	"""
+	Join the jobserver advertised by the environment if any, otherwise create it if this process is the caller.
+	"""
+	@staticmethod
+	def setup(config, isCaller):
+		if jobserver.isSetup:
+			if jobserver.size:
+				config["parallelism"] = jobserver.size
+			return
+		jobserver.isSetup = True
+
+		options = config["jobserver"]
+		jobserver.pressure = options.get("pressure", {})
+		if not options.get("enable", True) or os.name != "posix":
+			return
+
+		makeFlags = os.environ.get("MAKEFLAGS", "")
+		match = re.search(r"--jobserver-(?:auth|fds)=(\S+)", makeFlags)
+		if match:
+			try:
+				if match.group(1).startswith("fifo:"):
+					jobserver.readFd = jobserver.writeFd = os.open(match.group(1)[5:], os.O_RDWR | os.O_NONBLOCK)
+				else:
+					readFd, writeFd = [int(fd) for fd in match.group(1).split(",")]
+					os.fstat(readFd)
+					os.fstat(writeFd)
+					jobserver.fdList = [readFd, writeFd]
+					jobserver.readFd, jobserver.writeFd = jobserver.openNonBlocking(readFd), writeFd
+			except (OSError, ValueError) as e:
+				lib.warning("Could not join the jobserver '%s': %s" % (match.group(1), e))
+				return
+			sizeMatch = re.search(r"(?:^|\s)-j(\d+)", makeFlags)
+			jobserver.size = int(sizeMatch.group(1)) if sizeMatch else config["parallelism"]
+
+		elif isCaller:
+			# The descriptors form is used, as the named pipe form is only supported from GNU make 4.4
+			jobserver.size = max(config["parallelism"], 1)
+			readFd, writeFd = os.pipe()
+			os.write(writeFd, b"+" * (jobserver.size - 1))
+			if hasattr(os, "set_inheritable"):
+				os.set_inheritable(readFd, True)
+				os.set_inheritable(writeFd, True)
+			jobserver.fdList = [readFd, writeFd]
+			jobserver.readFd, jobserver.writeFd = jobserver.openNonBlocking(readFd), writeFd
+			os.environ["MAKEFLAGS"] = "%s -j%i --jobserver-fds=%i,%i --jobserver-auth=%i,%i" % (re.sub(r"(?:^|\s)-j\d*", "", makeFlags),
+					jobserver.size, readFd, writeFd, readFd, writeFd)
+
+		if jobserver.size:
+			config["parallelism"] = jobserver.size
+
+	"""
+	Open the read end of the pipe again as a distinct non-blocking file, so that reading does not block
+	if another process took the token first, without changing the mode of the pipe shared with them.
+	"""
+	@staticmethod
+	def openNonBlocking(fd):
+		try:
+			return os.open("/proc/self/fd/%i" % (fd), os.O_RDONLY | os.O_NONBLOCK)
+		except OSError:
+			return fd
+
+	"""
+	Keyword arguments to spawn a process which inherits the jobserver.
+	"""
+	@staticmethod
+	def popenArgs():
+		return {"pass_fds": jobserver.fdList} if sys.version_info[0] >= 3 and jobserver.fdList else {}
+
+	"""
+	Return a job token, or None if it could not be acquired before the timeout (in seconds).
+	If lend is set, the implicit token of this process is returned when available, this guarantees
+	that a process waiting for its dispatched processes always makes progress.
+	Without jobserver, tokens are unlimited.
+	"""
+	@staticmethod
+	def acquire(timeout=None, lend=False):
+		if jobserver.readFd is None:
+			return b""
+		deadline = None if timeout is None else time.time() + timeout
+		while True:
+			remaining = 1 if deadline is None else min(max(deadline - time.time(), 0), 1)
+			if lend and jobserver.lent.acquire(False):
+				return jobserver.LENT_TOKEN
+			if lend:
+				remaining = min(remaining, 0.1)
+			if jobserver.isUnderPressure():
+				time.sleep(remaining)
+			elif select.select([jobserver.readFd], [], [], remaining)[0]:
+				try:
+					token = os.read(jobserver.readFd, 1)
+					if token:
+						return token
+				except OSError as e:
+					# Another process took the token first
+					if e.errno not in [errno.EAGAIN, errno.EWOULDBLOCK]:
+						raise
+			if deadline is not None and time.time() >= deadline:
+				return None
+
+	"""
+	Hold a job token while this process does some work of its own. This is the implicit token
+	unless it is lent to a dispatched process, in which case one is taken from the jobserver.
+	"""
+	@staticmethod
+	def hold():
+		return jobserver.Token()
+
+	@staticmethod
+	def release(token):
+		if token is jobserver.LENT_TOKEN:
+			jobserver.lent.release()
+		elif token:
+			os.write(jobserver.writeFd, token)
+
+	"""
+	Tell if the pressure of any of the resources is above its threshold.
+	"""
+	@staticmethod
+	def isUnderPressure():
+		for resource, threshold in jobserver.pressure.items():
+			try:
+				with open("/proc/pressure/%s" % (resource), "r") as f:
+					# some avg10=0.00 avg60=0.00 avg300=0.00 total=0
+					avg10 = float(f.readline().split()[1].split("=")[1])
+			except (IOError, OSError, IndexError, ValueError):
+				continue
+			if avg10 > threshold:
+				return True
+		return False
+
+# ---- File system notifications ----------------------------------------------
+
+"""
+Minimalistic binding of the Linux inotify API, to watch directory trees for changes.
+"""
+class inotify(object):
+	IN_MODIFY = 0x00000002
+	IN_CLOSE_WRITE = 0x00000008
+	IN_MOVED_FROM = 0x00000040
+	IN_MOVED_TO = 0x00000080
+	IN_CREATE = 0x00000100
+	IN_DELETE = 0x00000200
+	IN_DELETE_SELF = 0x00000400
+	IN_Q_OVERFLOW = 0x00004000
+	IN_IGNORED = 0x00008000
+	IN_ISDIR = 0x40000000
+	MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+	def __init__(self, isIgnored):
+		import ctypes
+		import ctypes.util
+		self.ctypes = ctypes
+		self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+		self.fd = self.libc.inotify_init1(os.O_CLOEXEC)
+		if self.fd < 0:
+			raise OSError(ctypes.get_errno(), "Could not initialize inotify")
+		self.isIgnored = isIgnored
+		self.watchDict = {}
+
+	def close(self):
+		os.close(self.fd)
+
+	"""
+	Watch a directory and all its sub-directories, except the ignored ones.
+	"""
+	def addTree(self, path):
+		for root, dirs, files in os.walk(path):
+			dirs[:] = [name for name in dirs if not self.isIgnored(os.path.join(root, name))]
+			wd = self.libc.inotify_add_watch(self.fd, root.encode(sys.getfilesystemencoding()) if not isinstance(root, bytes) else root, inotify.MASK)
+			if wd < 0:
+				lib.warning("Could not watch '%s': %s" % (root, os.strerror(self.ctypes.get_errno())))
+			else:
+				self.watchDict[wd] = root
+
+	"""
+	Return the list of changed paths, empty if none changed before the timeout (in seconds).
+	"""
+	def read(self, timeout):
+		if not select.select([self.fd], [], [], timeout)[0]:
+			return []
+		data = os.read(self.fd, 65536)
+		pathList = []
+		offset = 0
+		while offset < len(data):
+			wd, mask, cookie, length = struct.unpack_from("iIII", data, offset)
+			name = data[offset + 16:offset + 16 + length].rstrip(b"\0").decode(sys.getfilesystemencoding())
+			offset += 16 + length
+			if mask & inotify.IN_Q_OVERFLOW:
+				# Events were lost, consider all watched directories as changed
+				pathList += list(self.watchDict.values())
+				continue
+			if mask & inotify.IN_IGNORED:
+				self.watchDict.pop(wd, None)
+				continue
+			if wd not in self.watchDict:
+				continue
+			path = os.path.join(self.watchDict[wd], name) if name else self.watchDict[wd]
+			if self.isIgnored(path):
+				continue
+			# Watch new directories
+			if (mask & inotify.IN_ISDIR) and (mask & (inotify.IN_CREATE | inotify.IN_MOVED_TO)):
+				self.addTree(path)
+			pathList.append(path)
+		return pathList
+
+	"""
+	Block until changes occur and return them once no more changes happened for the debounce time (in seconds).
+	"""
+	def wait(self, debounce):
+		pathSet = set()
+		while not pathSet:
+			pathSet.update(self.read(None))
+		while True:
+			pathList = self.read(debounce)
+			if not pathList:
+				return sorted(pathSet)
+			pathSet.update(pathList)
+
 # ---- Lib implementation -----------------------------------------------------
 
+"""
+Terminate a process and kill it if it is still running after the timeout (in seconds).
+Return True if the process had to be killed.
+"""
+def terminateProcess(proc, timeout=5):
+	killedList = []
+	def processTerminateTimeout():
+		proc.kill()
+		killedList.append(True)
+	timer = threading.Timer(timeout, processTerminateTimeout)
+	try:
+		timer.start()
+		if proc.poll() is None:
+			proc.terminate()
+		proc.wait()
+	finally:
+		timer.cancel()
+	return len(killedList) > 0
+
 """
 Minimalistic lib implementation as a fallback
 """
@@ -708,7 +1893,7 @@ class lib:
 		isReturnStdout = True if capture and not queue else False
 
 		proc = subprocess.Popen(command, cwd=cwd, shell=False, stdout=(subprocess.PIPE if capture or queue else None),
-			stderr=(subprocess.STDOUT if capture or queue else None))
+			stderr=(subprocess.STDOUT if capture or queue else None), **jobserver.popenArgs())
 
 		if not queue:
 			queue = Queue()
@@ -731,16 +1916,8 @@ class lib:
 
 		# Kill the process (max 5s)
 		if proc.poll() is None:
-			def processTerminateTimeout():
-				proc.kill()
+			if terminateProcess(proc):
 				errorMsgList.append("stalled")
-			timer = threading.Timer(5, processTerminateTimeout)
-			try:
-				timer.start()
-				proc.terminate()
-				proc.wait()
-			finally:
-				timer.cancel()
 
 		if proc.returncode != 0:
 			errorMsgList.append("return.code=%s" % (str(proc.returncode)))
@@ -764,29 +1941,36 @@ class lib:
 
 # -----------------------------------------------------------------------------
 
+"""
+Map each command to its action
+"""
+commandActions = {
+	"info": info,
+	"init": action,
+	"clean": action,
+	"build": action,
+	"start": commands,
+	"stop": commands,
+	"run": run,
+	"test": test,
+	"update": update
+}
+
 """
 Entry point fo the script
 """
 if __name__ == "__main__":
 
-	commandActions = {
-		"info": info,
-		"init": action,
-		"clean": action,
-		"build": action,
-		"start": commands,
-		"stop": commands,
-		"run": run,
-		"test": test,
-		"update": update
-	}
-
 	parser = argparse.ArgumentParser(description = "Application helper script.")
 	parser.add_argument("-r", "--root", action="store", dest="rootPath", default=EXECUTABLE_DIRECTORY_PATH, help="Change the root path (default=%s)." % (EXECUTABLE_DIRECTORY_PATH))
 	parser.add_argument("-c", "--config", action="store", dest="configPath", default=DEFAULT_CONFIG_FILE, help="Relative path of the build definition from the root path (default=%s)." % (DEFAULT_CONFIG_FILE))
 	parser.add_argument("-v", "--version", action='version', version="%s hash: %s" % (os.path.basename(__file__), str(getCurrentHash())))
+	parser.add_argument("--trace", action="store", dest="trace", default=None, help="Record the time spent in each phase and write it to this file in the Chrome trace-event format.")
+	parser.add_argument("--dispatch-mode", action="store", dest="dispatchMode", default=None, choices=["inprocess", "process"], help="Override how commands are dispatched to subprojects, within this process or in separate processes for isolation.")
 	# Internal only, add a prefix to the logging
 	parser.add_argument("--dispatch", action="store", dest="dispatch", default=False, help=argparse.SUPPRESS)
+	# Internal only, file descriptor where to send the events to the caller
+	parser.add_argument("--events-fd", type=int, action="store", dest="eventsFd", default=None, help=argparse.SUPPRESS)
 
 	subparsers = parser.add_subparsers(dest="command", help='List of available commands.')
 
@@ -797,6 +1981,8 @@ if __name__ == "__main__":
 	parserRun.add_argument("-c", "--cmd", action="append", dest="commandList", default=[], help="Command to be executed. More than one command can be executed simultaneously sequentially. If combined with --jobs the commands will be executed simultaneously.")
 	parserRun.add_argument("-i", "--iterations", type=int, action="store", dest="iterations", default=0, help="Number of iterations to be performed.")
 	parserRun.add_argument("-d", "--duration", type=int, action="store", dest="duration", default=0, help="Run the commands for a specific amount of time (in seconds).")
+	parserRun.add_argument("--fail-fast", action="store_true", dest="failFast", default=False, help="Cancel all other jobs and stop scheduling new iterations as soon as one fails.")
+	parserRun.add_argument("--until-failure", action="store_true", dest="untilFailure", default=False, help="Run the command endlessly and stop as soon as one fails, use --jobs to run several in parallel.")
 	parserRun.add_argument("-t", "--timeout", type=int, action="store", dest="timeout", default=-1, help="Timeout (in seconds) until the iteration should be considered as invalid. If set to -1, an automatic timeout is set, calculated based on the previous run. If set to 0, no timeout is set.")
 	parserRun.add_argument("args", nargs=argparse.REMAINDER, help='Extra arguments to be passed to the command executed.')
 
@@ -806,17 +1992,22 @@ if __name__ == "__main__":
 	parserTest.add_argument("-j", "--jobs", type=int, action="store", dest="nbJobs", default=1, help="Number of jobs to run in parallel. If 0 is used, the system will automatically pick the number of jobs based on the number of core.")
 	parserTest.add_argument("-i", "--iterations", type=int, action="store", dest="iterations", default=0, help="Number of iterations to be performed.")
 	parserTest.add_argument("-d", "--duration", type=int, action="store", dest="duration", default=0, help="Run the commands for a specific amount of time (in seconds).")
+	parserTest.add_argument("--fail-fast", action="store_true", dest="failFast", default=False, help="Cancel all other jobs and stop scheduling new iterations as soon as one fails.")
+	parserTest.add_argument("--until-failure", action="store_true", dest="untilFailure", default=False, help="Run the command endlessly and stop as soon as one fails, use --jobs to run several in parallel.")
 	parserTest.add_argument("-t", "--timeout", type=int, action="store", dest="timeout", default=-1, help="Timeout (in seconds) until the iteration should be considered as invalid. If set to -1, an automatic timeout is set, calculated based on the previous run. If set to 0, no timeout is set.")
+	parserTest.add_argument("-w", "--watch", action="store_true", dest="watch", default=False, help="Keep running, rerun the tests mapped to the modules affected by each change of the project files.")
 	parserTest.add_argument("filter", nargs=argparse.REMAINDER, help='Test filter, a string that matches the test key and test names.')
 
 	parserInfo = subparsers.add_parser("info", help='Display information about the script and the loaded modules.')
 	parserInfo.add_argument("--apps", action="store_true", dest="apps", default=False, help="Display information related to the status of running applications.")
 	parserInfo.add_argument("--json", action="store_true", dest="json", default=False, help="Print the output in json format.")
 
-	subparsers.add_parser("init", help='Initialize or setup the project environment.')
+	parserInit = subparsers.add_parser("init", help='Initialize or setup the project environment.')
+	parserInit.add_argument("-f", "--force", action="store_true", dest="force", default=False, help="Clean up the assets and artifacts and initialize all modules, even if they are up to date.")
 	subparsers.add_parser("clean", help='Clean the project environment from build artifacts.')
 	parserBuild = subparsers.add_parser("build", help='Build the project.')
 	parserBuild.add_argument("-c", "--config", action="append", dest="configList", default=[], help="Use this specific build configuration. Use the notation <moduleId>:<buildConfig> to target a specific module.")
+	parserBuild.add_argument("-w", "--watch", action="store_true", dest="watch", default=False, help="Keep running, rebuild the modules affected by each change of the project files.")
 	parserBuild.add_argument('target',  action='store', nargs='?', default=None, help='The target to build. If none, the default target will be built.')
 
 	parserUpdate = subparsers.add_parser("update", help='Update the tool to the latest version available.')
@@ -836,10 +2027,24 @@ if __name__ == "__main__":
 		parser.print_help()
 		sys.exit(1)
 
-	# Execute the proper action
-	fct(args)
+	if args.trace:
+		trace.enable(args.trace, "%s%s" % (args.dispatch if args.dispatch else "", os.path.realpath(args.rootPath)))
 
-	# Clean-up the library
-	if lib.destroy():
-		sys.exit(1)
-	sys.exit(0)
+	if args.eventsFd is not None:
+		events.enable(args.eventsFd, os.path.realpath(args.rootPath), args.dispatch if args.dispatch else "")
+
+	try:
+		# Execute the proper action
+		with trace.span(args.command, category="command"):
+			fct(args)
+
+		# Wait for the dispatched commands
+		isError = not events.wait()
+
+		# Clean-up the library
+		isError = lib.destroy() or isError
+	finally:
+		events.wait()
+		trace.save()
+
+	sys.exit(1 if isError else 0)
@@ -0,0 +1,438 @@
+#!/usr/bin/python
+# -*- coding: iso-8859-1 -*-
+
+"""
+Performance regression benchmarks of the app.py harness itself.
+
+Synthetic project trees are generated in a temporary directory, with a copy of app.py and stub
+modules in place of the .irapp dependencies, so that the suite runs offline. The results are
+written in JSON and compared against a baseline recorded beforehand, from the reference revision:
+
+	python benchmark/benchmark.py --update-baseline
+	python benchmark/benchmark.py
+
+The baseline is machine dependent, hence it is not versioned and must be recorded on the machine
+running the comparison.
+
+The shell benchmarks time the fallback lib.shell of app.py, the implementation provided by the
+.irapp dependencies is not available offline.
+"""
+
+import json
+import sys
+import os
+import argparse
+import gc
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+
+ROOT_PATH = os.path.realpath(os.path.join(os.path.dirname(__file__), ".."))
+APP_PATH = os.path.join(ROOT_PATH, "app.py")
+DEFAULT_BASELINE_PATH = os.path.join(os.path.realpath(os.path.dirname(__file__)), "baseline.json")
+
+# Stub of the .irapp package, it provides the interface used by app.py with modules doing nothing
+STUB_PACKAGE = """
+from . import lib
+
+def createModule(moduleId):
+	class Module(lib.Module):
+		pass
+	Module.__name__ = moduleId
+	return Module
+
+MODULE_LIST = [%s]
+
+def loadModules():
+	return {moduleId: createModule(moduleId) for moduleId in MODULE_LIST}
+
+def getTypeList():
+	return list(MODULE_LIST)
+"""
+
+STUB_LIB = """
+import sys
+import os
+import copy
+import shlex
+import subprocess
+
+logPrefix = ""
+
+def log(level, message):
+	sys.stdout.write("%s[%s] %s\\n" % (logPrefix, level, message))
+	sys.stdout.flush()
+
+def info(message):
+	log("INFO", message)
+
+def warning(message):
+	log("WARNING", message)
+
+def error(message):
+	log("ERROR", message)
+
+def fatal(message):
+	log("FATAL", message)
+	sys.exit(1)
+
+def configSanityCheck(config, user=False, modules=None):
+	pass
+
+def configPrintHelp(user=False, modules=None):
+	pass
+
+def path(*pathList):
+	return os.path.realpath(os.path.join(*pathList))
+
+def mkdir(path):
+	if not os.path.isdir(path):
+		os.makedirs(path)
+
+def rmtree(path):
+	import shutil
+	shutil.rmtree(path)
+
+def deepMerge(a, b):
+	merged = copy.deepcopy(a)
+	merged.update(b)
+	return merged
+
+def shellSplit(command):
+	return shlex.split(command)
+
+def shell(command, cwd=".", capture=False, ignoreError=False, blocking=True):
+	proc = subprocess.Popen(command, cwd=cwd, stdout=(subprocess.PIPE if capture else None))
+	output = proc.communicate()[0] if blocking else None
+	if blocking and proc.returncode and not ignoreError:
+		raise Exception("Failed to execute '%s'" % (" ".join(command)))
+	return output.decode("utf-8").splitlines() if output else []
+
+def shellMulti(commandList, cwd=".", nbIterations=1, nbJobs=1, **kwargs):
+	for iteration in range(max(nbIterations, 1)):
+		for command in commandList:
+			shell(command, cwd=cwd)
+
+def getCommand(config, name, typeIds, values):
+	return "true" if name == "run" else None
+
+def start(config, commandList):
+	pass
+
+def destroy():
+	return False
+
+class Module(object):
+	def __init__(self, globalConfig):
+		self.globalConfig = globalConfig
+	@staticmethod
+	def check(config):
+		return True
+	@staticmethod
+	def config():
+		return {}
+	def getDefaultBuildType(self):
+		return "debug"
+	def getDefaultBuild(self):
+		return {}
+	def setDefaultBuildType(self, buildType):
+		return True
+	def getConfig(self, keyList, default=None, onlySpecific=False):
+		return default
+	def info(self, verbose):
+		return {"builds": {"debug": {"type": "debug"}, "release": {"type": "release"}}, "targets": ["all"]}
+	def getStatusList(self):
+		return []
+	def init(self):
+		pass
+	def build(self, target):
+		pass
+	def clean(self):
+		pass
+	def stop(self, appId):
+		pass
+	def runPre(self, commandList):
+		pass
+	def runPost(self, commandList):
+		pass
+"""
+
+"""
+Generate a project tree at the given path, the fan out list gives the number of dispatched
+subprojects per level, for example [8, 4] creates 8 subprojects with 4 subprojects each.
+"""
+def createTree(path, fanOutList=[], nbModules=4, config={}):
+	os.makedirs(os.path.join(path, ".irapp", "lib"))
+	shutil.copy(APP_PATH, os.path.join(path, "app.py"))
+	with open(os.path.join(path, ".irapp", "__init__.py"), "w") as f:
+		f.write(STUB_PACKAGE % (", ".join(["\"module%i\"" % (index) for index in range(nbModules)])))
+	with open(os.path.join(path, ".irapp", "lib", "__init__.py"), "w") as f:
+		f.write(STUB_LIB)
+
+	# Dispatched paths are relative to the working directory, which is the root of the tree
+	def createProject(relativePath, fanOutList, config):
+		dispatchList = []
+		for index in range(fanOutList[0] if fanOutList else 0):
+			subRelativePath = os.path.join(relativePath, "sub%i" % (index))
+			os.makedirs(os.path.join(path, subRelativePath))
+			createProject(subRelativePath, fanOutList[1:], {})
+			dispatchList.append(subRelativePath)
+		# The jobserver is disabled, it would export MAKEFLAGS to the benchmark process otherwise
+		projectConfig = {"jobserver": {"enable": False}}
+		projectConfig.update(config)
+		projectConfig["dispatch"] = dispatchList
+		with open(os.path.join(path, relativePath, ".irapp.json"), "w") as f:
+			json.dump(projectConfig, f)
+	createProject(".", fanOutList, config)
+	return path
+
+"""
+Load the app.py copy of a tree as a module.
+"""
+def loadApp(treePath):
+	appPath = os.path.join(treePath, "app.py")
+	name = "app_%s" % (os.path.basename(treePath))
+	try:
+		import importlib.util
+		spec = importlib.util.spec_from_file_location(name, appPath)
+		module = importlib.util.module_from_spec(spec)
+		spec.loader.exec_module(module)
+		return module
+	except ImportError:
+		import imp
+		return imp.load_source(name, appPath)
+
+"""
+Redirect the standard output to the null device while running the function.
+"""
+def silent(fct):
+	def wrapper(*args, **kwargs):
+		stdout = sys.stdout
+		with open(os.devnull, "w") as sys.stdout:
+			try:
+				return fct(*args, **kwargs)
+			finally:
+				sys.stdout = stdout
+	return wrapper
+
+def runApp(treePath, argList):
+	with open(os.devnull, "w") as devnull:
+		subprocess.check_call([sys.executable, "app.py"] + argList, cwd=treePath, stdout=devnull, stderr=devnull)
+
+# ---- Benchmarks --------------------------------------------------------------
+
+"""
+Each benchmark is a function returning the function to be timed, given the working directory.
+"""
+def benchmarkCliVersion(workPath):
+	treePath = createTree(os.path.join(workPath, "cli.version"))
+	return lambda: runApp(treePath, ["--version"])
+
+def benchmarkCliInfo(workPath):
+	treePath = createTree(os.path.join(workPath, "cli.info"))
+	return lambda: runApp(treePath, ["info"])
+
+def benchmarkReadConfig(workPath):
+	config = {
+		"tests": {"type%i" % (index): ["tests/test%i_%i" % (index, test) for test in range(20)] for index in range(100)},
+		"builds": {"build%i" % (index): {"compiler": "gcc", "flags": ["-O%i" % (index % 4)] * 10} for index in range(500)},
+		"start": {"preset%i" % (index): ["command %i" % (command) for command in range(10)] for index in range(200)},
+		"dependencies": {"debian": ["package%i" % (index) for index in range(500)]},
+		"ignore": ["builds.build%i" % (index) for index in range(0, 500, 2)]
+	}
+	treePath = createTree(os.path.join(workPath, "readConfig"), nbModules=20, config=config)
+	app = loadApp(treePath)
+	args = argparse.Namespace(rootPath=treePath, configPath=".irapp.json", dispatch=False, dispatchMode=None, command="info")
+	# Do not account for the first load of the dependencies
+	silent(app.readConfig)(args, verbose=False)
+	return lambda: silent(app.readConfig)(args, verbose=False)
+
+def benchmarkApplyIgnore(workPath):
+	app = loadApp(createTree(os.path.join(workPath, "applyIgnore")))
+	def createConfig(depth):
+		if depth == 0:
+			return "value"
+		return {"key%i" % (index): createConfig(depth - 1) for index in range(6)}
+	ignoreList = []
+	for index in range(2000):
+		keyList = ["key%i" % ((index * (level + 3)) % 6) for level in range(6)]
+		# Some of the patterns use wildcards
+		if index % 10 == 0:
+			keyList[3] = "key*"
+		ignoreList.append(".".join(keyList))
+	def run():
+		app.applyIgnore(app.createIgnoreDict(ignoreList), createConfig(6))
+	return run
+
+def benchmarkDispatch(mode):
+	def benchmark(workPath):
+		treePath = createTree(os.path.join(workPath, "dispatch.%s" % (mode)), fanOutList=[6, 4])
+		return lambda: runApp(treePath, ["--dispatch-mode", mode, "info"])
+	return benchmark
+
+"""
+The shell benchmarks time the fallback lib.shell of app.py, not the one of the .irapp dependencies.
+"""
+def benchmarkShellCapture(workPath):
+	app = loadApp(createTree(os.path.join(workPath, "fallbackShell.capture")))
+	command = [sys.executable, "-c", "import sys\nfor i in range(200000): sys.stdout.write('line %i\\n' % i)"]
+	return lambda: app.lib.shell(command, capture=True)
+
+def benchmarkShellSpawn(workPath):
+	app = loadApp(createTree(os.path.join(workPath, "fallbackShell.spawn")))
+	command = ["true"] if os.path.exists("/bin/true") else [sys.executable, "-S", "-c", "pass"]
+	def run():
+		for index in range(20):
+			app.lib.shell(command, capture=True)
+	return run
+
+def benchmarkPrintTable(workPath):
+	app = loadApp(createTree(os.path.join(workPath, "printTable")))
+	headerList = [
+			{"key": "id", "name": "Name"},
+			{"key": "type", "name": "Type"},
+			{"key": "pid", "name": "PID"},
+			{"key": "uptime", "name": "Uptime", "formater": app.formaterTime},
+			{"key": "cpu", "name": "CPU %"},
+			{"key": "memory", "name": "Memory", "formater": app.formaterMemory},
+			{"key": "restart", "name": "Restart"},
+			{"key": "log", "name": "Log"}]
+	def run():
+		statusList = [{"id": "app%i" % (index), "type": "daemon", "pid": 1000 + index, "uptime": index * 37,
+				"cpu": index % 100, "memory": index * 123456, "restart": index % 3, "log": "/var/log/app%i.log" % (index)} for index in range(5000)]
+		silent(app.printTable)(headerList, statusList, indent=3)
+	return run
+
+"""
+List of benchmarks as tuples (name, benchmark, number of repetitions)
+"""
+BENCHMARK_LIST = [
+	("cli.version", benchmarkCliVersion, 10),
+	("cli.info", benchmarkCliInfo, 10),
+	("readConfig.large", benchmarkReadConfig, 10),
+	("applyIgnore.deep", benchmarkApplyIgnore, 10),
+	("dispatch.inprocess", benchmarkDispatch("inprocess"), 5),
+	("dispatch.process", benchmarkDispatch("process"), 3),
+	("fallbackShell.capture", benchmarkShellCapture, 5),
+	("fallbackShell.spawn", benchmarkShellSpawn, 5),
+	("printTable.status", benchmarkPrintTable, 10)
+]
+
+# -----------------------------------------------------------------------------
+
+"""
+Run the benchmarks and return the results, the median and minimum time in seconds per benchmark.
+The benchmarks are run in rounds, one repetition of each per round, so that the repetitions of a
+benchmark are spread over the whole run rather than all being affected by the same load spike.
+"""
+def runBenchmarks(filterList, repeatFactor):
+	workPath = tempfile.mkdtemp(prefix="irapp-benchmark-")
+	environ = dict(os.environ)
+
+	# Benchmarks must not influence each other through the environment
+	def call(fct):
+		try:
+			return fct()
+		finally:
+			os.environ.clear()
+			os.environ.update(environ)
+
+	try:
+		benchmarkList = []
+		for name, benchmark, repeat in BENCHMARK_LIST:
+			if filterList and not any(filt in name for filt in filterList):
+				continue
+			benchmarkList.append((name, call(lambda: benchmark(workPath)), max(int(repeat * repeatFactor), 1), []))
+
+		for index in range(max([repeat for name, fct, repeat, durationList in benchmarkList] + [0])):
+			for name, fct, repeat, durationList in benchmarkList:
+				if index >= repeat:
+					continue
+				# As with timeit, the garbage collector does not run while timing
+				gc.collect()
+				gc.disable()
+				try:
+					timeStart = time.time()
+					call(fct)
+					durationList.append(time.time() - timeStart)
+				finally:
+					gc.enable()
+	finally:
+		shutil.rmtree(workPath, ignore_errors=True)
+
+	results = {}
+	for name, fct, repeat, durationList in benchmarkList:
+		durationList.sort()
+		results[name] = {
+			"median": durationList[int(len(durationList) / 2)],
+			"min": durationList[0],
+			"repeat": len(durationList)
+		}
+		print("%-24s median=%.4fs min=%.4fs (x%i)" % (name, results[name]["median"], results[name]["min"], len(durationList)))
+	return results
+
+"""
+Compare the results against the baseline, return the list of regressions. The minimum time is
+compared, as it is the least sensitive to the load of the machine.
+"""
+def compare(results, baseline, tolerance, minDelta):
+	regressionList = []
+	for name, result in sorted(results.items()):
+		if name not in baseline:
+			print("%-24s no baseline" % (name))
+			continue
+		reference = baseline[name]["min"]
+		ratio = result["min"] / reference if reference else 1
+		isRegression = (ratio > 1 + tolerance) and (result["min"] - reference > minDelta)
+		print("%-24s %.4fs vs %.4fs (%+.1f%%)%s" % (name, result["min"], reference, (ratio - 1) * 100, " REGRESSION" if isRegression else ""))
+		if isRegression:
+			regressionList.append(name)
+	return regressionList
+
+if __name__ == "__main__":
+
+	parser = argparse.ArgumentParser(description = "Performance regression benchmarks of %s." % (os.path.basename(APP_PATH)))
+	parser.add_argument("-b", "--baseline", action="store", dest="baselinePath", default=DEFAULT_BASELINE_PATH, help="Path of the baseline results (default=%s)." % (DEFAULT_BASELINE_PATH))
+	parser.add_argument("-o", "--output", action="store", dest="outputPath", default=None, help="Write the results in JSON format to this file.")
+	parser.add_argument("-t", "--tolerance", type=float, action="store", dest="tolerance", default=0.25, help="Relative slowdown of the minimum tolerated before reporting a regression (default=0.25).")
+	parser.add_argument("--min-delta", type=float, action="store", dest="minDelta", default=0.005, help="Absolute slowdown (in seconds) under which a difference is considered as noise (default=0.005).")
+	parser.add_argument("-r", "--repeat", type=float, action="store", dest="repeatFactor", default=1, help="Factor applied to the number of repetitions of each benchmark.")
+	parser.add_argument("-u", "--update-baseline", action="store_true", dest="updateBaseline", default=False, help="Store the results as the new baseline.")
+	parser.add_argument("filter", nargs="*", help="Only run the benchmarks whose name contains one of these strings.")
+	args = parser.parse_args()
+
+	results = runBenchmarks(args.filter, args.repeatFactor)
+	output = {
+		"python": platform.python_version(),
+		"platform": platform.platform(),
+		"results": results
+	}
+
+	if args.outputPath:
+		with open(args.outputPath, "w") as f:
+			json.dump(output, f, indent=4, sort_keys=True)
+
+	if args.updateBaseline:
+		baseline = {}
+		if os.path.isfile(args.baselinePath):
+			with open(args.baselinePath, "r") as f:
+				baseline = json.load(f)["results"]
+		baseline.update(results)
+		with open(args.baselinePath, "w") as f:
+			json.dump(dict(output, results=baseline), f, indent=4, sort_keys=True)
+		print("Baseline updated: %s" % (args.baselinePath))
+		sys.exit(0)
+
+	if not os.path.isfile(args.baselinePath):
+		print("No baseline available at %s, use --update-baseline to create it." % (args.baselinePath))
+		sys.exit(0)
+
+	with open(args.baselinePath, "r") as f:
+		baseline = json.load(f)["results"]
+	regressionList = compare(results, baseline, args.tolerance, args.minDelta)
+	if regressionList:
+		print("Regression(s) detected: %s" % (", ".join(regressionList)))
+		sys.exit(1)
+	sys.exit(0)